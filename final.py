@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd 
 import re
+from functools import lru_cache
 import sqlite3
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 import sys
 
 # Dictionary mapping team codes to team names
@@ -13,6 +15,88 @@ nhl_teams = {"ANH":"Anaheim Ducks","ARI":"Arizona Coyotes","BOS":"Boston Bruins"
         "SEA":"Seattle Kraken","STL":"St. Louis Blues","TB":"Tampa Bay Lightning","TOR":"Toronto Maple Leafs","VAN":"Vancouver Canucks",\
         "VGK":"Vegas Golden Knights","WAS":"Washington Capitals","WPG":"Winnipeg Jets"}
 
+# Team code in parentheses, e.g. "Connor McDavid (EDM)"; compiled once instead of on every lookup
+team_code_pattern = re.compile(r'\(([A-Z]+)\)')
+
+@lru_cache(maxsize=4)
+def _read_skaters_csv(file_path):
+    """
+    Parses a skaters CSV file once per path and caches the resulting DataFrame.
+
+    Parameters:
+    - file_path (str): The path to the CSV file containing skaters data.
+
+    Returns:
+    - A DataFrame containing skaters data. It is shared between callers and must not be modified.
+    """
+    # The first CSV row is a grouping banner, so the column names are on the second row.
+    # low_memory=False parses the file in one pass instead of re-inferring dtypes per chunk
+    # Single-season counting stats are well under 32,767, so int16 is enough and quarters their memory;
+    # read_csv wraps larger values silently, so multi-season files would need int32.
+    # 'Team' and 'Pos' only hold a few distinct codes, so they are stored as categories
+    return pd.read_csv(file_path, skiprows=1, engine='c', low_memory=False,
+                       dtype={'Team': 'category', 'Pos': 'category', 'G': 'int16', 'A': 'int16', 'PIM': 'int16', 'Hits': 'int16'})
+
+@lru_cache(maxsize=4)
+def _read_goalies_csv(file_path):
+    """
+    Parses a goalies CSV file once per path and caches the resulting DataFrame.
+
+    Parameters:
+    - file_path (str): The path to the CSV file containing goalies data.
+
+    Returns:
+    - A DataFrame containing goalies data. It is shared between callers and must not be modified.
+    """
+    # Career and multi-season saves and shots against pass 32,767, so they use int32
+    return pd.read_csv(file_path, skiprows=1, engine='c', low_memory=False,
+                       dtype={'Team': 'category', 'SV': 'int32', 'SA': 'int32', 'SV%': 'float32'})
+
+def _top_k(df, column, k):
+    """
+    Returns the k rows with the largest values in a column, in descending order.
+
+    Parameters:
+    - df (pandas.DataFrame): The DataFrame to select rows from.
+    - column (str): The numeric column to rank by.
+    - k (int): The number of rows to return.
+
+    Returns:
+    - A DataFrame with the top k rows. Ties keep their original row order and missing values rank last,
+      the same as sort_values(ascending=False).head(k) with a stable sort.
+    """
+    values = df[column].to_numpy()
+    k = min(k, len(values))
+    if k <= 0:
+        return df.iloc[:0]
+    rows = np.arange(len(values))
+    missing = rows[:0]
+    if values.dtype.kind == 'f':
+        # Missing values rank below everything, -inf included, so they are set aside and only fill up the end
+        is_missing = np.isnan(values)
+        missing = np.flatnonzero(is_missing)
+        rows = np.flatnonzero(~is_missing)
+        values = values[rows]
+    n = len(values)
+    picked = rows[:0]
+    if n > 0:
+        top_n = min(k, n)
+        # An O(n) partition finds the k-th largest value without sorting every row. Values are never
+        # negated, since that breaks unsigned columns and the smallest signed value
+        cutoff = values[np.argpartition(values, n - top_n)[n - top_n]]
+        # One scan of the column finds every row at or above the cutoff; everything after that only
+        # touches those few rows. Keep all rows above the cutoff plus the earliest rows tied at it
+        candidates = np.flatnonzero(values >= cutoff)
+        tied = values[candidates] == cutoff
+        above = candidates[~tied]
+        picked = np.sort(np.concatenate((above, candidates[tied][:top_n - len(above)])))
+        # Only the selected rows are sorted: a stable ascending sort of the reversed selection,
+        # reversed again, is descending with ties still in their original row order
+        reversed_picked = picked[::-1]
+        picked = rows[reversed_picked[np.argsort(values[reversed_picked], kind='stable')][::-1]]
+    top = np.concatenate((picked, missing[:k - len(picked)]))
+    return df.iloc[top]
+
 class Player:
     """
     A class that represents an NHL player.
@@ -27,6 +111,9 @@ class Player:
     Methods:
     - None
     """
+    # Fixed attribute slots instead of a per-instance __dict__ keep many Player objects small
+    __slots__ = ('name', 'team', 'position', 'goals', 'penalty_minutes')
+
     def __init__(self, name, team, position, goals, penalty_minutes):
         self.name = name
         self.team = team
@@ -43,12 +130,32 @@ class Team:
     - players (list): A list of Player objects representing the team's players.
 
     Methods:
-    - None
+    - extract_team_code(player_info): Extracts the team code from player information.
     """
     def __init__(self, name, players):
         self.name = name
         self.players = players
- 
+
+    @staticmethod
+    def extract_team_code(player_info):
+        """
+        Extracts the team code from player information.
+
+        Parameters:
+        - player_info (str): Player information containing the team code in parentheses.
+
+        Returns:
+        - str: The extracted team code if found, or None if not found.
+        """
+        # Use a regular expression to search for a team code in parentheses
+        match = team_code_pattern.search(player_info)
+        if match:
+            # If a match is found, return the extracted team code
+            return match.group(1)
+        else:
+            # If no match is found, return None
+            return None
+
 
 class PlayerHandler:
     """
@@ -78,7 +185,8 @@ class PlayerHandler:
         Returns:
         - A DataFrame containing skaters data.
         """
-        skaters = pd.read_csv(file_path)
+        # Return a copy so callers can add columns without changing the cached DataFrame
+        skaters = _read_skaters_csv(file_path).copy()
         return skaters
 
     def filter_skaters_by_position(self, skaters, position):
@@ -93,8 +201,29 @@ class PlayerHandler:
         - A filtered DataFrame containing skaters with the specified position.
         """
         # Using boolean indexing to filter skaters based on the specified position
+        # ('Pos' is categorical, so this compares small integer codes rather than strings)
         return skaters[skaters['Pos'] == position]
 
+    def calculate_points(self, skaters):
+        """
+        Calculates total points for each skater.
+
+        Parameters:
+        - skaters (pandas.DataFrame): DataFrame containing skaters data.
+
+        Returns:
+        - A DataFrame with an additional 'Points' column.
+        """
+        # Add goals ('G') and assists ('A') on the underlying numpy arrays to skip Series index alignment
+        goals = skaters['G'].to_numpy()
+        assists = skaters['A'].to_numpy()
+        # G and A are loaded as int16, so add them in int32 (dtype=) to rule out overflow;
+        # out= alone would still add in int16 and only cast the wrapped result
+        points = np.empty(len(skaters), dtype=np.int32)
+        np.add(goals, assists, out=points, dtype=np.int32)
+        skaters['Points'] = points
+        return skaters
+
     def top_players_by_goals(self,skaters, num_players=5):
         """
         Returns the top players based on points.
@@ -106,10 +235,8 @@ class PlayerHandler:
         Returns:
         - The top players based on points.
         """
-        # Sort skaters DataFrame by the 'G' (goals) column in descending order
-        sorted_skaters = skaters.sort_values(by=['G'], ascending=[False])
-        # Return the first 'num_players' rows from the sorted DataFrame
-        return sorted_skaters.head(num_players)
+        # Select the 'num_players' skaters with the most goals ('G') without sorting the whole DataFrame
+        return _top_k(skaters, 'G', num_players)
 
     def read_goalies_data(self,file_path):
         """
@@ -121,7 +248,7 @@ class PlayerHandler:
         Returns:
         - A DataFrame containing goalies data.
         """
-        goalies = pd.read_csv(file_path)
+        goalies = _read_goalies_csv(file_path).copy()
         return goalies
 
     def calculate_save_percentage(self,goalies):
@@ -135,7 +262,10 @@ class PlayerHandler:
         - A DataFrame with an additional 'Save Percentage' column.
         """
         # Calculate save percentage by dividing 'SV' (saves) by 'SA' (shots against)
-        goalies['SavePercentage'] = goalies['SV'] / goalies['SA']
+        # Goalies who have faced no shots get a save percentage of 0 instead of NaN
+        saves = goalies['SV'].to_numpy(dtype=np.float64)
+        shots_against = goalies['SA'].to_numpy(dtype=np.float64)
+        goalies['SavePercentage'] = np.divide(saves, shots_against, out=np.zeros_like(saves), where=shots_against != 0)
         # Return a DataFrame with 'Player Name' and 'Save Percentage' columns
         return goalies[['Player Name', 'SavePercentage']]
 
@@ -150,10 +280,8 @@ class PlayerHandler:
         Returns:
         - The top goalies based on save percentage.
         """
-        # Sort the goalies DataFrame by 'SV%' (save percentage) in descending order
-        sorted_goalies = goalies.sort_values(by='SV%', ascending=False)
-        # Return the top 'num_goalies' goalies from the sorted DataFrame
-        return sorted_goalies.head(num_goalies)
+        # Select the 'num_goalies' goalies with the highest 'SV%' (save percentage) without a full sort
+        return _top_k(goalies, 'SV%', num_goalies)
     
     def top_players_by_hits(self, skaters, num_players=10):
         """
@@ -166,10 +294,8 @@ class PlayerHandler:
         Returns:
         - A DataFrame with the top players based on hits.
         """
-        # Sort skaters DataFrame by 'Hits' column in descending order
-        sorted_skaters = skaters.sort_values(by='Hits', ascending=False)
-        # Return the top 'num_players' players based on hits
-        return sorted_skaters.head(num_players)
+        # Select the top 'num_players' players based on hits without a full sort
+        return _top_k(skaters, 'Hits', num_players)
 
     def top_players_by_pim(self, skaters, num_players=10):
         """
@@ -182,10 +308,8 @@ class PlayerHandler:
         Returns:
         - A DataFrame with the top players based on penalty minutes.
         """
-        # Sort skaters DataFrame by 'PIM' (Penalty Minutes) column in descending order
-        sorted_skaters = skaters.sort_values(by='PIM', ascending=False)
-        # Return the top 'num_players' players based on penalty minutes
-        return sorted_skaters.head(num_players)
+        # Select the top 'num_players' players based on 'PIM' (Penalty Minutes) without a full sort
+        return _top_k(skaters, 'PIM', num_players)
 
 
 class Goalie(Player):
@@ -201,6 +325,7 @@ class Goalie(Player):
     Methods:
     - None
     """
+    __slots__ = ('saves', 'goals_allowed')
 
     def __init__(self, name, country, saves, goals_allowed):
         """
@@ -222,37 +347,6 @@ class Goalie(Player):
         self.goals_allowed = goals_allowed
 
 
-class Team:
-    """
-    A class for handling NHL team-related functionalities.
-
-    Methods:
-    - extract_team_code(player_info): Extracts the team code from player information.
-
-    Attributes:
-    - None
-    """
-
-    def extract_team_code(player_info):
-        """
-        Extracts the team code from player information.
-
-        Parameters:
-        - player_info (str): Player information containing the team code in parentheses.
-
-        Returns:
-        - str: The extracted team code if found, or None if not found.
-        """
-        # Use a regular expression to search for a team code in parentheses
-        match = re.search(r'\(([A-Z]+)\)', player_info)
-        if match:
-            # If a match is found, return the extracted team code
-            return match.group(1)
-        else:
-            # If no match is found, return None
-            return None
-
-
 #module 9 - GIT Hub. I am incoperating this module by uplaoding my progress and final into git hub
 
 
@@ -267,6 +361,7 @@ class DataHandler:
     - None
     """
 
+    @staticmethod
     def create_dataframe(players):
         """
         Creates a Pandas DataFrame from a list of player objects.
@@ -275,10 +370,14 @@ class DataHandler:
         - players (list): A list of Player objects.
 
         Returns:
-        - pandas.DataFrame: A DataFrame containing player data.
+        - pandas.DataFrame: A DataFrame with one column per player attribute
+          (name, team, position, goals, penalty_minutes).
         """
-        # Use Pandas to create a DataFrame from the list of player objects
-        return pd.DataFrame(players)
+        # Read each player's attributes once and store them column by column, so later
+        # sorting and filtering work on whole columns instead of individual Player objects
+        return pd.DataFrame.from_records(
+            ((player.name, player.team, player.position, player.goals, player.penalty_minutes) for player in players),
+            columns=['name', 'team', 'position', 'goals', 'penalty_minutes'])
 
 
 class SQL:
@@ -292,6 +391,7 @@ class SQL:
     - None
     """
 
+    @staticmethod
     def create_database(players):
         """
         Creates an SQLite database and inserts player data.
@@ -310,12 +410,12 @@ class SQL:
         # Create a table if it doesn't exist with columns: name, team, position, goals, penalty_minutes
         c.execute('CREATE TABLE IF NOT EXISTS players (name TEXT, team TEXT, position TEXT, goals INTEGER, penalty_minutes INTEGER)')
 
-        # Insert player data into the 'players' table
-        for player in players:
-            c.execute('INSERT INTO players VALUES (?, ?, ?, ?, ?)', (player.name, player.team, player.position, player.goals, player.penalty_minutes))
+        # Insert all player data into the 'players' table in a single transaction, reusing one prepared statement
+        with conn:
+            c.executemany('INSERT INTO players VALUES (?, ?, ?, ?, ?)',
+                          ((player.name, player.team, player.position, player.goals, player.penalty_minutes) for player in players))
 
-        # Commit the changes to the database and close the connection
-        conn.commit()
+        # Close the connection (the 'with' block already committed the changes)
         conn.close()
 
 
@@ -332,13 +432,11 @@ def goal_scorers_analysis(sdf, num):
     """
     # Create a PlayerHandler instance
     players = PlayerHandler()
-    # Get the top goal scorers using the PlayerHandler instance
+    # Get the top goal scorers using the PlayerHandler instance (already sorted by goals)
     top_scorers = players.top_players_by_goals(sdf, num)
-    # Sort the top scorers DataFrame by goals (G) in descending order
-    sorted_top_scorers = top_scorers.sort_values(by='G', ascending=False)
     # Print information about the top goal scorers
     print(f"\nTop {num} Goal Scorers:")
-    print(sorted_top_scorers[['Player Name', 'G', 'Team Name']])
+    print(top_scorers[['Player Name', 'G', 'Team Name']])
 
 def goalies_analysis(gdf, num):
     """
@@ -353,10 +451,8 @@ def goalies_analysis(gdf, num):
     """
     # Create a PlayerHandler instance for goalies
     goalies = PlayerHandler()
-    # Get the top goalies based on save percentage using the PlayerHandler instance
+    # Get the top goalies based on save percentage using the PlayerHandler instance (already sorted by SV%)
     top_goalies = goalies.top_goalies_by_save_percentage(gdf, num)
-    # Sort the top goalies DataFrame by save percentage (SV%) in descending order
-    top_goalies = top_goalies.sort_values(by='SV%', ascending=False)
     print(top_goalies[['Player Name', 'SV%', 'Team Name']])
 
 def hitters_analysis(sdf, num):
@@ -409,16 +505,37 @@ def skaters_analysis(sdf):
     """
     # Create a PlayerHandler instance
     skaters = PlayerHandler()
-    # Create a copy of the skaters' DataFrame
-    skaters_df = sdf.copy()
-    # Calculate points by adding goals (G) and assists (A)
-    skaters_df['Points'] = skaters_df['G'] + skaters_df['A']
+    # Calculate points by adding goals (G) and assists (A) without copying the whole DataFrame
+    points = sdf['G'].astype('int32') + sdf['A']
     # Get the top 10 goal scorers based on points
-    top_goal_scorers = skaters_df.sort_values(by='Points', ascending=False).head(10)
+    top_goal_scorers = _top_k(sdf[['Player Name']].assign(Points=points), 'Points', 10)
     # Print information about the top 10 goal scorers
     print("\nTop 10 Goal Scorers:")
     print(top_goal_scorers[['Player Name', 'Points']])
 
+# Maps each command-line option to its progress message, analysis function, and the PlayerHandler reader and data file it needs
+analyses = {
+    'topgoalscorers': ("Processing Top {num} Goal Scorers...", goal_scorers_analysis, PlayerHandler.read_skaters_data, "nhl-stats_1.csv"),
+    'bestgoalies': ("Processing Best {num} Goalies...", goalies_analysis, PlayerHandler.read_goalies_data, "nhl-stats_2.csv"),
+    'biggesthitters': ("Processing Biggest Hitters...", hitters_analysis, PlayerHandler.read_skaters_data, "nhl-stats_1.csv"),
+    'penaltyminutes': ("Processing Penalty Minutes Analysis...", penalty_minutes_analysis, PlayerHandler.read_skaters_data, "nhl-stats_1.csv"),
+}
+
+def positive_int(value):
+    """
+    Converts a command-line value to an int and rejects numbers below 1.
+
+    Parameters:
+    - value (str): The value given on the command line.
+
+    Returns:
+    - int: The number of rows to show.
+    """
+    num = int(value)
+    if num < 1:
+        raise ArgumentTypeError(f"must be at least 1, got {num}")
+    return num
+
 def parse_args(arglist):
     """
     Parses command-line arguments for the NHL Stats Analyzer.
@@ -432,11 +549,12 @@ def parse_args(arglist):
     # Create an ArgumentParser instance with a description
     parser = ArgumentParser(description="NHL Stats Analyzer")
     
-    # Add command-line arguments for different analysis options
-    parser.add_argument('-tgs', '--topgoalscorers', nargs=1, type=int, help="Show Top Goal Scorers (include n scorers)")
-    parser.add_argument('-bg', '--bestgoalies', nargs=1, type=int, help="Show Best Goalies (include n goalies)")
-    parser.add_argument('-bh', '--biggesthitters', nargs=1, type=int, help="Show Biggest Hitters (include n hitters)")
-    parser.add_argument('-pm', '--penaltyminutes', nargs=1, type=int, help="Show Players With Highest Penalty Minutes")
+    # Add command-line arguments for different analysis options (only one analysis runs at a time)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-tgs', '--topgoalscorers', nargs=1, type=positive_int, help="Show Top Goal Scorers (include n scorers)")
+    group.add_argument('-bg', '--bestgoalies', nargs=1, type=positive_int, help="Show Best Goalies (include n goalies)")
+    group.add_argument('-bh', '--biggesthitters', nargs=1, type=positive_int, help="Show Biggest Hitters (include n hitters)")
+    group.add_argument('-pm', '--penaltyminutes', nargs=1, type=positive_int, help="Show Players With Highest Penalty Minutes")
     
     # Parse the command-line arguments and return the result
     return parser.parse_args(arglist)
@@ -445,30 +563,21 @@ if __name__ == "__main__":
     # Parse command-line arguments
     args = parse_args(sys.argv[1:])
 
-    # Read skaters data from CSV file and add 'Team Name' column
-    skaters_df = pd.read_csv("nhl-stats_1.csv", skiprows=1)
-    skaters_df['Team Name'] = skaters_df['Team'].map(nhl_teams)
-
-    # Read goalies data from CSV file and add 'Team Name' column
-    goalies_df = pd.read_csv("nhl-stats_2.csv", skiprows=1)
-    goalies_df['Team Name'] = goalies_df['Team'].map(nhl_teams)
-
-    # Perform analysis based on user's command-line arguments
-    if args.topgoalscorers:
-        num = args.topgoalscorers[0]
-        print(f"Processing Top {num} Goal Scorers...")
-        goal_scorers_analysis(skaters_df, num)
-    elif args.bestgoalies:
-        num = args.bestgoalies[0]
-        print(f"Processing Best {num} Goalies...")
-        goalies_analysis(goalies_df, num)
-    elif args.biggesthitters:
-        num = args.biggesthitters[0]
-        print("Processing Biggest Hitters...")
-        hitters_analysis(skaters_df, num)
-    elif args.penaltyminutes:
-        num = args.penaltyminutes[0]
-        print("Processing Penalty Minutes Analysis...")
-        penalty_minutes_analysis(skaters_df, num)
-    else:
+    # Find the analysis the user asked for
+    choice = next((option for option in analyses if getattr(args, option)), None)
+    if choice is None:
         print("Invalid choice. Please select a valid option.")
+    else:
+        message, analysis, reader, file_path = analyses[choice]
+        num = getattr(args, choice)[0]
+        print(message.format(num=num))
+
+        # Only read the data file this analysis needs
+        handler = PlayerHandler()
+        df = reader(handler, file_path)
+        # Add 'Team Name' column
+        # ('Team' is categorical, so map() looks up each team code once instead of once per row)
+        df['Team Name'] = df['Team'].map(nhl_teams)
+
+        # Perform the analysis
+        analysis(df, num)